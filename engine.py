@@ -0,0 +1,56 @@
+"""
+Engine factory for the Protege.ai platform.
+
+Ingestion from Open Finance APIs writes transactions, schedules, movements
+and positions in large batches. The bottleneck for these workloads is the
+number of round trips to the database rather than CPU, so the engine is
+configured to pack many rows into each ``INSERT`` statement and to keep
+the compiled form of repeated statements cached:
+
+* ``insertmanyvalues_page_size`` controls how many parameter sets are
+  rendered into a single multi-row ``INSERT ... VALUES`` (and
+  ``RETURNING``) statement.
+* on psycopg2, ``executemany_mode="values_plus_batch"`` additionally
+  batches ``UPDATE`` and ``DELETE`` executemany calls with
+  ``execute_batch``, ``executemany_batch_page_size`` rows at a time.
+* ``query_cache_size`` sizes the per-engine cache of compiled SQL. It is
+  set to roughly 60 entries per hot statement so the ingestion and lookup
+  statements stay resident without the cache growing unbounded. With
+  ``echo=True`` each logged statement reports ``[cached since ...]`` on a
+  hit and ``[generated in ...]`` on a miss.
+
+Any keyword argument accepted by :func:`sqlalchemy.create_engine` can be
+passed through and overrides these defaults.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Union
+
+from sqlalchemy import create_engine as sa_create_engine
+from sqlalchemy.engine import URL, Engine, make_url
+
+
+INSERTMANYVALUES_PAGE_SIZE = 10_000
+EXECUTEMANY_BATCH_PAGE_SIZE = 1_000
+QUERY_CACHE_SIZE = 1_200
+
+
+def create_engine(url: Union[str, URL], **kwargs: Any) -> Engine:
+    """Create an engine tuned for bulk ingestion.
+
+    The returned engine uses large ``insertmanyvalues`` pages and a sized
+    compiled-statement cache on every dialect and, for PostgreSQL with
+    psycopg2, the ``values_plus_batch`` executemany mode.
+    """
+
+    url = make_url(url)
+    options: dict[str, Any] = {
+        "insertmanyvalues_page_size": INSERTMANYVALUES_PAGE_SIZE,
+        "query_cache_size": QUERY_CACHE_SIZE,
+    }
+    if url.get_backend_name() == "postgresql" and url.get_driver_name() == "psycopg2":
+        options["executemany_mode"] = "values_plus_batch"
+        options["executemany_batch_page_size"] = EXECUTEMANY_BATCH_PAGE_SIZE
+    options.update(kwargs)
+    return sa_create_engine(url, **options)
@@ -23,10 +23,90 @@ The models are organised into several domains:
 * ``consent/payments`` – consents granted by the customer for data access
   and payment orders initiated via Open Finance (e.g. PIX).
 
+Enumerated values (account types, payment statuses, etc.) are stored as
+short strings guarded by a ``CHECK`` constraint rather than native database
+enum types. The ``enum.Enum`` classes below derive from ``str`` so their
+members can be assigned to and compared with these columns directly.
+
+Monetary amounts are exact ``Numeric`` columns returned as ``Decimal``.
+Valuation and rate columns used in analytic scans (``avg_price``,
+``mark_to_market``, ``rate``, ``rate_nominal``) are returned as ``float``
+to avoid building a ``Decimal`` per fetched row.
+
+Columns are declared in PostgreSQL alignment order (integers and keys,
+timestamps, dates, small integers and booleans, then variable-length
+numerics and text) to minimise per-row padding.
+
+On PostgreSQL the append-only time series tables (``account_balances``,
+``account_transactions``, ``card_transactions`` and
+``investment_movements``) are range partitioned by date; their primary key
+is ``(id, <partition column>)`` because PostgreSQL requires the partition
+key in every unique index. Monthly partitions must exist before rows are
+inserted and are managed with :mod:`protege_ai.partitions`. SQLite cannot
+generate ids for composite primary keys, so rows for these tables must be
+given an explicit ``id`` there.
+
+Primary keys are 64-bit ``IDENTITY`` columns with a sequence cache of
+1000 values, so PostgreSQL allocates ids in blocks rather than advancing
+the sequence for every row. Generated ids are returned through
+``INSERT ... RETURNING``.
+
+Ingested rows carry the provider's identifier in ``external_id`` (PIX
+end-to-end id for payment orders), backed by a unique constraint so that
+retried ingests can be written with ``INSERT ... ON CONFLICT DO NOTHING``
+(``bulk_insert(..., ignore_conflicts=True)``). On partitioned tables the
+constraint also includes the partition column.
+
+Currencies and merchant category codes are normalised into the
+``currencies`` and ``merchant_category_codes`` dimension tables and
+referenced through ``SMALLINT`` keys (``currency_id``, ``mcc_id``). The
+``currency`` and ``mcc`` hybrid attributes still read and write the codes.
+In queries they compare the key column directly, so
+``CardTransaction.currency == "USD"`` filters on ``currency_id = 840``
+without touching the dimension tables.
+
+Sparse, provider-specific attributes of account and card transactions
+(``description``, ``merchant_name`` and anything a provider adds) are kept
+in a single ``extra`` JSON column (``JSONB`` with a GIN index on
+PostgreSQL) rather than in mostly-NULL columns. The named attributes are
+exposed as hybrids over ``extra``, so ``CardTransaction.merchant_name``
+still works both on instances and in queries. Equality filters render as
+``extra @> ...`` on PostgreSQL so the GIN index serves them; other
+comparisons extract the text value and are not indexed.
+
 These classes are defined using SQLAlchemy's declarative base. To use
 them, import ``Base`` and the desired classes into your application, bind
 them to an engine and call ``Base.metadata.create_all(engine)``.
 
+Child rows are removed by the database through ``ON DELETE CASCADE``.
+With ``passive_deletes`` the ORM does not load a collection just to delete
+its members, but collections that are already loaded (including the
+``selectin`` ones below) are still deleted row by row. To leave the whole
+cascade to the database, load the parent with :func:`default_options`
+before ``session.delete()`` or issue a Core
+``delete(CustomerCore).where(...)``; either emits a single ``DELETE``.
+On SQLite this requires foreign key enforcement to be enabled on each
+connection (``PRAGMA foreign_keys=ON``).
+
+Collections are eagerly loaded with ``selectin`` (one ``IN`` query per
+relationship instead of one query per parent). Time series collections
+(``Account.balances``, ``Account.transactions``, ``Card.transactions`` and
+``CardInvoice.transactions``) can grow to millions of rows and are not
+loaded implicitly: accessing them without an explicit ``selectinload()``
+raises ``InvalidRequestError`` instead of silently issuing a query.
+Queries can extend that guarantee to every relationship with
+:func:`default_options`:
+
+.. code-block:: python
+
+   from sqlalchemy import select
+   from sqlalchemy.orm import selectinload
+
+   stmt = select(CustomerCore).options(
+       selectinload(CustomerCore.accounts), *default_options()
+   )
+   customers = session.scalars(stmt).all()
+
 Note: This file does not perform any I/O or network operations; it merely
 defines the schema. Persistence and repository patterns should be
 implemented elsewhere in the application.
@@ -41,25 +121,170 @@ from decimal import Decimal
 from typing import Optional
 
 from sqlalchemy import (
+    CHAR,
+    BigInteger,
     Boolean,
-    Column,
+    CheckConstraint,
+    DDL,
     Date,
     DateTime,
-    Enum,
     ForeignKey,
+    Identity,
+    Index,
+    JSON,
     Integer,
     Numeric,
+    SmallInteger,
     String,
     Text,
     UniqueConstraint,
+    desc,
+    event,
+    func,
+    bindparam,
+    insert,
+    literal_column,
+    select,
+    text,
+    type_coerce,
 )
-from sqlalchemy.orm import declarative_base, relationship
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.ext.hybrid import Comparator, hybrid_property
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, raiseload, relationship
+from sqlalchemy.schema import CreateColumn
+from sqlalchemy.sql import operators
+from sqlalchemy.sql.expression import ColumnElement
+from sqlalchemy.sql.visitors import InternalTraversal
+
+from .currencies import CURRENCY_CODES, CURRENCY_IDS, DEFAULT_CURRENCY_ID, ISO_4217_CURRENCIES
+
+
+class Base(DeclarativeBase):
+    """Declarative base shared by all Protege.ai models.
+
+    Every model has a server-generated identity key and most carry
+    ``server_default`` timestamps; ``eager_defaults`` fetches them with
+    ``RETURNING`` as part of the ``INSERT`` instead of a follow-up
+    ``SELECT`` when the attributes are next accessed.
+    """
+
+    __mapper_args__ = {"eager_defaults": True}
+
+
+# Type of primary and foreign key columns. SQLite only autoincrements
+# columns declared exactly as ``INTEGER PRIMARY KEY``, so the 64-bit type
+# is narrowed there.
+_BigId = BigInteger().with_variant(Integer, "sqlite")
+
+
+@compiles(CreateColumn, "sqlite")
+def _create_column_sqlite(element: CreateColumn, compiler, **kw) -> str:
+    """Render identity columns of composite primary keys on SQLite.
+
+    The partitioned tables mark ``id`` as ``autoincrement=True`` so that
+    PostgreSQL uses it as the ``insertmanyvalues`` sentinel and batches
+    ``INSERT ... RETURNING``. SQLite rejects that flag on a composite key;
+    the column is emitted as a plain ``NOT NULL`` integer and ids are
+    supplied by the caller there.
+    """
+
+    column = element.element
+    if column.autoincrement is True and len(column.table.primary_key.columns) > 1:
+        type_ = compiler.dialect.type_compiler_instance.process(column.type, type_expression=column)
+        return f"{compiler.preparer.format_column(column)} {type_} NOT NULL"
+    return compiler.visit_create_column(element, **kw)
+
+# Sparse provider attributes; JSONB (GIN-indexable) on PostgreSQL.
+_Extra = JSON().with_variant(JSONB(), "postgresql")
+
+
+def default_options() -> tuple:
+    """Return loader options that forbid implicit relationship loading.
+
+    Any relationship not eagerly loaded by an explicit option raises on
+    access instead of emitting a lazy ``SELECT``, turning N+1 regressions
+    into hard errors.
+    """
+
+    return (raiseload("*"),)
+
+
+def _extra_field(key: str) -> hybrid_property:
+    """Build a hybrid attribute stored under ``key`` in the ``extra`` column."""
+
+    def fget(self) -> Optional[str]:
+        return (self.extra or {}).get(key)
+
+    def fset(self, value: Optional[str]) -> None:
+        extra = {k: v for k, v in (self.extra or {}).items() if k != key}
+        if value is not None:
+            extra[key] = value
+        self.extra = extra or None
+
+    def comparator(cls) -> _ExtraFieldComparator:
+        return _ExtraFieldComparator(cls.extra, key)
+
+    return hybrid_property(fget, fset, custom_comparator=comparator)
+
+
+class _ExtraContains(ColumnElement[bool]):
+    """``extra`` holds ``value`` under ``key``.
+
+    Rendered as ``extra @> jsonb_build_object(key, value)`` on PostgreSQL,
+    which the GIN index on ``extra`` can serve, and as a comparison of the
+    extracted text value elsewhere.
+    """
+
+    __visit_name__ = "extra_contains"
+    _is_implicitly_boolean = True
+    inherit_cache = True
+    _traverse_internals = [
+        ("extra", InternalTraversal.dp_clauseelement),
+        ("key", InternalTraversal.dp_string),
+        ("value", InternalTraversal.dp_clauseelement),
+    ]
+    type = Boolean()
 
+    def __init__(self, extra, key: str, value: str) -> None:
+        self.extra = extra
+        self.key = key
+        self.value = bindparam(None, value, String())
 
-Base = declarative_base()
 
+@compiles(_ExtraContains)
+def _compile_extra_contains(element: _ExtraContains, compiler, **kw) -> str:
+    return compiler.process(element.extra[element.key].as_string() == element.value, **kw)
 
-class MaritalStatus(enum.Enum):
+
+@compiles(_ExtraContains, "postgresql")
+def _compile_extra_contains_postgresql(element: _ExtraContains, compiler, **kw) -> str:
+    document = func.jsonb_build_object(literal_column(f"'{element.key}'"), element.value)
+    return compiler.process(type_coerce(element.extra, JSONB()).contains(document), **kw)
+
+
+class _ExtraFieldComparator(Comparator[str]):
+    """Compare an ``extra`` hybrid, using JSON containment for equality."""
+
+    def __init__(self, extra, key: str) -> None:
+        super().__init__(extra[key].as_string())
+        self.extra = extra
+        self.key = key
+
+    def operate(self, op, *other, **kwargs):
+        if op is operators.eq and other[0] is not None:
+            return _ExtraContains(self.extra, self.key, other[0])
+        return op(self.expression, *other, **kwargs)
+
+
+def _enum_check(column: str, values: type[enum.Enum], name: str) -> CheckConstraint:
+    """Build a ``CHECK`` constraint restricting ``column`` to the enum values."""
+
+    allowed = ", ".join(f"'{member.value}'" for member in values)
+    return CheckConstraint(f"{column} IN ({allowed})", name=name)
+
+
+class MaritalStatus(str, enum.Enum):
     """Enumeration of marital statuses for individuals."""
 
     SINGLE = "single"
@@ -69,7 +294,7 @@ class MaritalStatus(enum.Enum):
     OTHER = "other"
 
 
-class AccountType(enum.Enum):
+class AccountType(str, enum.Enum):
     """Enumeration of account types supported by Open Finance."""
 
     CHECKING = "checking"
@@ -78,7 +303,7 @@ class AccountType(enum.Enum):
     PAYMENT = "payment"
 
 
-class CardProductType(enum.Enum):
+class CardProductType(str, enum.Enum):
     """Enumeration of card product types."""
 
     CREDIT = "credit"
@@ -86,7 +311,7 @@ class CardProductType(enum.Enum):
     HYBRID = "hybrid"
 
 
-class CreditProductType(enum.Enum):
+class CreditProductType(str, enum.Enum):
     """Enumeration of credit product types."""
 
     LOAN = "loan"
@@ -94,7 +319,7 @@ class CreditProductType(enum.Enum):
     OVERDRAFT = "overdraft"
 
 
-class InvestmentInstrumentType(enum.Enum):
+class InvestmentInstrumentType(str, enum.Enum):
     """Enumeration of investment instrument types."""
 
     FUND = "fund"
@@ -104,7 +329,7 @@ class InvestmentInstrumentType(enum.Enum):
     TREASURY = "treasury"
 
 
-class PaymentStatus(enum.Enum):
+class PaymentStatus(str, enum.Enum):
     """Enumeration of payment order status values."""
 
     PENDING = "pending"
@@ -113,6 +338,118 @@ class PaymentStatus(enum.Enum):
     CANCELLED = "cancelled"
 
 
+class Currency(Base):
+    """ISO 4217 currency.
+
+    Small dimension table referenced by ``currency_id`` on transaction and
+    payment tables. The primary key is the ISO numeric code (986 for BRL),
+    so it is stable and fits in a ``SMALLINT``. Rows are seeded from
+    :data:`protege_ai.currencies.ISO_4217_CURRENCIES` when the table is
+    created.
+    """
+
+    __tablename__ = "currencies"
+
+    id: Mapped[int] = mapped_column(SmallInteger, primary_key=True, autoincrement=False)
+    code: Mapped[str] = mapped_column(CHAR(3), unique=True)
+
+
+class MerchantCategoryCode(Base):
+    """ISO 18245 merchant category code (MCC).
+
+    Referenced by ``mcc_id`` on transaction tables. The primary key is the
+    numeric value of the four-digit code. Codes must be registered (e.g.
+    with ``repository.register_merchant_category_codes``) before
+    transactions referencing them are inserted.
+    """
+
+    __tablename__ = "merchant_category_codes"
+
+    id: Mapped[int] = mapped_column(SmallInteger, primary_key=True, autoincrement=False)
+    code: Mapped[str] = mapped_column(CHAR(4), unique=True)
+    description: Mapped[Optional[str]] = mapped_column(Text)
+
+
+class _CodeComparator(Comparator[str]):
+    """Compare a code hybrid by translating codes to the ``SMALLINT`` key.
+
+    ``CardTransaction.currency == "USD"`` renders as ``currency_id = 840``
+    so filters use the key column (and its indexes) without a join or
+    subquery against the dimension table. Only equality and membership
+    tests are supported; other operators raise ``ValueError``.
+    """
+
+    def __init__(self, column, to_id) -> None:
+        super().__init__(column)
+        self.to_id = to_id
+
+    _SCALAR_OPERATORS = (operators.eq, operators.ne, operators.is_, operators.is_not)
+    _LIST_OPERATORS = (operators.in_op, operators.not_in_op)
+
+    def operate(self, op, *other, **kwargs):
+        if op in self._LIST_OPERATORS:
+            other = ([self.to_id(code) for code in other[0]],)
+        elif op in self._SCALAR_OPERATORS:
+            other = tuple(self.to_id(code) for code in other)
+        else:
+            raise ValueError(
+                f"operator {op.__name__!r} is not supported on code attributes; "
+                "use ==, !=, is_(), in_() or not_in(), or filter on the key column"
+            )
+        return op(self.expression, *other, **kwargs)
+
+
+def _currency_id(code: Optional[str]) -> Optional[int]:
+    if code is None:
+        return None
+    try:
+        return CURRENCY_IDS[code]
+    except KeyError:
+        raise ValueError(f"unknown currency code {code!r}") from None
+
+
+def _mcc_id(code: Optional[str]) -> Optional[int]:
+    if code is None:
+        return None
+    if len(code) != 4 or not code.isdigit():
+        raise ValueError(f"invalid merchant category code {code!r}")
+    return int(code)
+
+
+class _CurrencyCode:
+    """Expose ``currency`` as the ISO code behind ``currency_id``."""
+
+    @hybrid_property
+    def currency(self) -> Optional[str]:
+        return None if self.currency_id is None else CURRENCY_CODES[self.currency_id]
+
+    @currency.inplace.setter
+    def _currency_setter(self, code: Optional[str]) -> None:
+        self.currency_id = _currency_id(code)
+
+    @currency.inplace.comparator
+    @classmethod
+    def _currency_comparator(cls) -> _CodeComparator:
+        return _CodeComparator(cls.currency_id, _currency_id)
+
+
+class _MerchantCategory:
+    """Expose ``mcc`` as the four-digit code behind ``mcc_id``."""
+
+    @hybrid_property
+    def mcc(self) -> Optional[str]:
+        return None if self.mcc_id is None else f"{self.mcc_id:04d}"
+
+    @mcc.inplace.setter
+    def _mcc_setter(self, code: Optional[str]) -> None:
+        self.mcc_id = _mcc_id(code)
+
+    @mcc.inplace.comparator
+    @classmethod
+    def _mcc_comparator(cls) -> _CodeComparator:
+        return _CodeComparator(cls.mcc_id, _mcc_id)
+
+
 class CustomerCore(Base):
     """Core demographic and identity information for a customer.
 
@@ -123,22 +460,67 @@ class CustomerCore(Base):
     """
 
     __tablename__ = "customer_core"
+    __table_args__ = (
+        _enum_check("marital_status", MaritalStatus, name="ck_customer_marital_status"),
+    )
 
-    id = Column(Integer, primary_key=True)
-    tax_id = Column(String(32), unique=True, nullable=False, index=True)
-    birthdate = Column(Date, nullable=True)
-    marital_status = Column(Enum(MaritalStatus), nullable=True)
-    dependents_count = Column(Integer, nullable=True)
-    pep_flag = Column(Boolean, nullable=False, default=False)
-
-    contacts = relationship("CustomerContact", back_populates="customer", cascade="all, delete-orphan")
-    accounts = relationship("Account", back_populates="customer", cascade="all, delete-orphan")
-    cards = relationship("Card", back_populates="customer", cascade="all, delete-orphan")
-    credit_contracts = relationship("CreditContract", back_populates="customer", cascade="all, delete-orphan")
-    investment_positions = relationship("PositionFund", back_populates="customer", cascade="all, delete-orphan")
-    fx_operations = relationship("FxOperation", back_populates="customer", cascade="all, delete-orphan")
-    consents = relationship("Consent", back_populates="customer", cascade="all, delete-orphan")
-    payment_orders = relationship("PaymentOrder", back_populates="customer", cascade="all, delete-orphan")
+    id: Mapped[int] = mapped_column(_BigId, Identity(always=False, cache=1000), primary_key=True)
+    birthdate: Mapped[Optional[date]] = mapped_column(Date)
+    dependents_count: Mapped[Optional[int]] = mapped_column(SmallInteger)
+    pep_flag: Mapped[bool] = mapped_column(Boolean, default=False)
+    # active_history loads the previous value before an update so the
+    # repository's tax id cache can evict it on rename.
+    tax_id: Mapped[str] = mapped_column(String(32), unique=True, index=True, active_history=True)
+    marital_status: Mapped[Optional[str]] = mapped_column(String(16))  # MaritalStatus
+
+    contacts: Mapped[list[CustomerContact]] = relationship(
+        back_populates="customer",
+        cascade="save-update, merge, delete, delete-orphan",
+        passive_deletes=True,
+        lazy="selectin",
+    )
+    accounts: Mapped[list[Account]] = relationship(
+        back_populates="customer",
+        cascade="save-update, merge, delete, delete-orphan",
+        passive_deletes=True,
+        lazy="selectin",
+    )
+    cards: Mapped[list[Card]] = relationship(
+        back_populates="customer",
+        cascade="save-update, merge, delete, delete-orphan",
+        passive_deletes=True,
+        lazy="selectin",
+    )
+    credit_contracts: Mapped[list[CreditContract]] = relationship(
+        back_populates="customer",
+        cascade="save-update, merge, delete, delete-orphan",
+        passive_deletes=True,
+        lazy="selectin",
+    )
+    investment_positions: Mapped[list[PositionFund]] = relationship(
+        back_populates="customer",
+        cascade="save-update, merge, delete, delete-orphan",
+        passive_deletes=True,
+        lazy="selectin",
+    )
+    fx_operations: Mapped[list[FxOperation]] = relationship(
+        back_populates="customer",
+        cascade="save-update, merge, delete, delete-orphan",
+        passive_deletes=True,
+        lazy="selectin",
+    )
+    consents: Mapped[list[Consent]] = relationship(
+        back_populates="customer",
+        cascade="save-update, merge, delete, delete-orphan",
+        passive_deletes=True,
+        lazy="selectin",
+    )
+    payment_orders: Mapped[list[PaymentOrder]] = relationship(
+        back_populates="customer",
+        cascade="save-update, merge, delete, delete-orphan",
+        passive_deletes=True,
+        lazy="selectin",
+    )
 
 
 class CustomerContact(Base):
@@ -151,13 +533,13 @@ class CustomerContact(Base):
 
     __tablename__ = "customer_contacts"
 
-    id = Column(Integer, primary_key=True)
-    customer_id = Column(Integer, ForeignKey("customer_core.id", ondelete="CASCADE"), nullable=False)
-    type = Column(String(32), nullable=False)
-    value = Column(String(255), nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    id: Mapped[int] = mapped_column(_BigId, Identity(always=False, cache=1000), primary_key=True)
+    customer_id: Mapped[int] = mapped_column(_BigId, ForeignKey("customer_core.id", ondelete="CASCADE"), index=True)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    type: Mapped[str] = mapped_column(String(32))
+    value: Mapped[str] = mapped_column(String(255))
 
-    customer = relationship("CustomerCore", back_populates="contacts")
+    customer: Mapped[CustomerCore] = relationship(back_populates="contacts", lazy="joined")
 
 
 class Account(Base):
@@ -170,19 +552,32 @@ class Account(Base):
     """
 
     __tablename__ = "accounts"
+    __table_args__ = (
+        _enum_check("account_type", AccountType, name="ck_account_type"),
+    )
 
-    id = Column(Integer, primary_key=True)
-    customer_id = Column(Integer, ForeignKey("customer_core.id", ondelete="CASCADE"), nullable=False)
-    account_type = Column(Enum(AccountType), nullable=False)
-    institution = Column(String(255), nullable=True)
-    branch_number = Column(String(20), nullable=True)
-    account_number = Column(String(20), nullable=True)
-    opening_date = Column(Date, nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
-
-    customer = relationship("CustomerCore", back_populates="accounts")
-    balances = relationship("AccountBalance", back_populates="account", cascade="all, delete-orphan")
-    transactions = relationship("AccountTransaction", back_populates="account", cascade="all, delete-orphan")
+    id: Mapped[int] = mapped_column(_BigId, Identity(always=False, cache=1000), primary_key=True)
+    customer_id: Mapped[int] = mapped_column(_BigId, ForeignKey("customer_core.id", ondelete="CASCADE"), index=True)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    opening_date: Mapped[Optional[date]] = mapped_column(Date)
+    account_type: Mapped[str] = mapped_column(String(16))  # AccountType
+    institution: Mapped[Optional[str]] = mapped_column(String(255))
+    branch_number: Mapped[Optional[str]] = mapped_column(String(20))
+    account_number: Mapped[Optional[str]] = mapped_column(String(20))
+
+    customer: Mapped[CustomerCore] = relationship(back_populates="accounts")
+    balances: Mapped[list[AccountBalance]] = relationship(
+        back_populates="account",
+        cascade="save-update, merge, delete, delete-orphan",
+        passive_deletes=True,
+        lazy="raise_on_sql",
+    )
+    transactions: Mapped[list[AccountTransaction]] = relationship(
+        back_populates="account",
+        cascade="save-update, merge, delete, delete-orphan",
+        passive_deletes=True,
+        lazy="raise_on_sql",
+    )
 
 
 class AccountBalance(Base):
@@ -196,17 +591,19 @@ class AccountBalance(Base):
     __tablename__ = "account_balances"
     __table_args__ = (
         UniqueConstraint("account_id", "as_of", name="uix_account_balance_as_of"),
+        Index("ix_account_balance_account_latest", "account_id", desc("as_of")),
+        {"postgresql_partition_by": "RANGE (as_of)"},
     )
 
-    id = Column(Integer, primary_key=True)
-    account_id = Column(Integer, ForeignKey("accounts.id", ondelete="CASCADE"), nullable=False)
-    available_balance = Column(Numeric(18, 2), nullable=False)
-    as_of = Column(DateTime, nullable=False, default=datetime.utcnow)
+    id: Mapped[int] = mapped_column(_BigId, Identity(always=False, cache=1000), primary_key=True, autoincrement=True)
+    account_id: Mapped[int] = mapped_column(_BigId, ForeignKey("accounts.id", ondelete="CASCADE"))
+    as_of: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True, server_default=func.now())
+    available_balance: Mapped[Decimal] = mapped_column(Numeric(18, 2))
 
-    account = relationship("Account", back_populates="balances")
+    account: Mapped[Account] = relationship(back_populates="balances")
 
 
-class AccountTransaction(Base):
+class AccountTransaction(_CurrencyCode, _MerchantCategory, Base):
     """Transaction performed on an account.
 
     Represents a single debit or credit posted to a bank account. Fields
@@ -216,18 +613,31 @@ class AccountTransaction(Base):
     """
 
     __tablename__ = "account_transactions"
+    __table_args__ = (
+        Index("ix_account_tx_account_posting", "account_id", "posting_date"),
+        Index("ix_account_tx_customer_posting", "customer_id", "posting_date"),
+        UniqueConstraint("external_id", "posting_date", name="uix_account_tx_external"),
+        Index("ix_account_tx_extra_gin", "extra", postgresql_using="gin").ddl_if(dialect="postgresql"),
+        {"postgresql_partition_by": "RANGE (posting_date)"},
+    )
+
+    id: Mapped[int] = mapped_column(_BigId, Identity(always=False, cache=1000), primary_key=True, autoincrement=True)
+    account_id: Mapped[int] = mapped_column(_BigId, ForeignKey("accounts.id", ondelete="CASCADE"))
+    customer_id: Mapped[int] = mapped_column(_BigId, ForeignKey("customer_core.id", ondelete="CASCADE"))  # denormalised
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    posting_date: Mapped[date] = mapped_column(Date, primary_key=True)
+    transaction_date: Mapped[Optional[date]] = mapped_column(Date)
+    currency_id: Mapped[int] = mapped_column(
+        SmallInteger, ForeignKey("currencies.id"), server_default=text(str(DEFAULT_CURRENCY_ID))
+    )
+    mcc_id: Mapped[Optional[int]] = mapped_column(SmallInteger, ForeignKey("merchant_category_codes.id"))
+    amount: Mapped[Decimal] = mapped_column(Numeric(18, 2))
+    external_id: Mapped[Optional[str]] = mapped_column(String(64))  # provider transaction id
+    extra: Mapped[Optional[dict]] = mapped_column(_Extra)
 
-    id = Column(Integer, primary_key=True)
-    account_id = Column(Integer, ForeignKey("accounts.id", ondelete="CASCADE"), nullable=False)
-    amount = Column(Numeric(18, 2), nullable=False)
-    currency = Column(String(3), nullable=False, default="BRL")
-    mcc = Column(String(8), nullable=True)
-    description = Column(Text, nullable=True)
-    posting_date = Column(Date, nullable=False)
-    transaction_date = Column(Date, nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    description = _extra_field("description")
 
-    account = relationship("Account", back_populates="transactions")
+    account: Mapped[Account] = relationship(back_populates="transactions")
 
 
 class Card(Base):
@@ -239,17 +649,30 @@ class Card(Base):
     """
 
     __tablename__ = "cards"
+    __table_args__ = (
+        _enum_check("product_type", CardProductType, name="ck_card_product_type"),
+    )
 
-    id = Column(Integer, primary_key=True)
-    customer_id = Column(Integer, ForeignKey("customer_core.id", ondelete="CASCADE"), nullable=False)
-    card_number = Column(String(20), unique=True, nullable=False)
-    product_type = Column(Enum(CardProductType), nullable=False)
-    issuer = Column(String(255), nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
-
-    customer = relationship("CustomerCore", back_populates="cards")
-    invoices = relationship("CardInvoice", back_populates="card", cascade="all, delete-orphan")
-    transactions = relationship("CardTransaction", back_populates="card", cascade="all, delete-orphan")
+    id: Mapped[int] = mapped_column(_BigId, Identity(always=False, cache=1000), primary_key=True)
+    customer_id: Mapped[int] = mapped_column(_BigId, ForeignKey("customer_core.id", ondelete="CASCADE"), index=True)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    card_number: Mapped[str] = mapped_column(String(20), unique=True)
+    product_type: Mapped[str] = mapped_column(String(16))  # CardProductType
+    issuer: Mapped[Optional[str]] = mapped_column(String(255))
+
+    customer: Mapped[CustomerCore] = relationship(back_populates="cards")
+    invoices: Mapped[list[CardInvoice]] = relationship(
+        back_populates="card",
+        cascade="save-update, merge, delete, delete-orphan",
+        passive_deletes=True,
+        lazy="selectin",
+    )
+    transactions: Mapped[list[CardTransaction]] = relationship(
+        back_populates="card",
+        cascade="save-update, merge, delete, delete-orphan",
+        passive_deletes=True,
+        lazy="raise_on_sql",
+    )
 
 
 class CardInvoice(Base):
@@ -261,20 +684,26 @@ class CardInvoice(Base):
     """
 
     __tablename__ = "card_invoices"
+    __table_args__ = (
+        Index("ix_card_invoice_customer_statement", "customer_id", "statement_date"),
+    )
 
-    id = Column(Integer, primary_key=True)
-    card_id = Column(Integer, ForeignKey("cards.id", ondelete="CASCADE"), nullable=False)
-    statement_date = Column(Date, nullable=False)
-    due_date = Column(Date, nullable=False)
-    total_amount = Column(Numeric(18, 2), nullable=False)
-    minimum_payment = Column(Numeric(18, 2), nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    id: Mapped[int] = mapped_column(_BigId, Identity(always=False, cache=1000), primary_key=True)
+    card_id: Mapped[int] = mapped_column(_BigId, ForeignKey("cards.id", ondelete="CASCADE"), index=True)
+    customer_id: Mapped[int] = mapped_column(_BigId, ForeignKey("customer_core.id", ondelete="CASCADE"))  # denormalised
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    statement_date: Mapped[date] = mapped_column(Date)
+    due_date: Mapped[date] = mapped_column(Date)
+    total_amount: Mapped[Decimal] = mapped_column(Numeric(18, 2))
+    minimum_payment: Mapped[Decimal] = mapped_column(Numeric(18, 2))
 
-    card = relationship("Card", back_populates="invoices")
-    transactions = relationship("CardTransaction", back_populates="invoice", cascade="all, delete-orphan")
+    card: Mapped[Card] = relationship(back_populates="invoices")
+    # Read-only: transactions are assigned to an invoice through
+    # ``CardTransaction.invoice``.
+    transactions: Mapped[list[CardTransaction]] = relationship(viewonly=True, lazy="raise_on_sql")
 
 
-class CardTransaction(Base):
+class CardTransaction(_CurrencyCode, _MerchantCategory, Base):
     """Transaction made using a credit or debit card.
 
     Represents individual purchase or payment events on a card. Each
@@ -283,21 +712,36 @@ class CardTransaction(Base):
     """
 
     __tablename__ = "card_transactions"
+    __table_args__ = (
+        Index("ix_card_tx_card_transaction_date", "card_id", "transaction_date"),
+        Index("ix_card_tx_customer_transaction_date", "customer_id", "transaction_date"),
+        UniqueConstraint("external_id", "transaction_date", name="uix_card_tx_external"),
+        Index("ix_card_tx_extra_gin", "extra", postgresql_using="gin").ddl_if(dialect="postgresql"),
+        {"postgresql_partition_by": "RANGE (transaction_date)"},
+    )
+
+    id: Mapped[int] = mapped_column(_BigId, Identity(always=False, cache=1000), primary_key=True, autoincrement=True)
+    card_id: Mapped[int] = mapped_column(_BigId, ForeignKey("cards.id", ondelete="CASCADE"))
+    invoice_id: Mapped[Optional[int]] = mapped_column(
+        _BigId, ForeignKey("card_invoices.id", ondelete="SET NULL"), index=True
+    )
+    customer_id: Mapped[int] = mapped_column(_BigId, ForeignKey("customer_core.id", ondelete="CASCADE"))  # denormalised
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    transaction_date: Mapped[date] = mapped_column(Date, primary_key=True)
+    posting_date: Mapped[Optional[date]] = mapped_column(Date)
+    currency_id: Mapped[int] = mapped_column(
+        SmallInteger, ForeignKey("currencies.id"), server_default=text(str(DEFAULT_CURRENCY_ID))
+    )
+    mcc_id: Mapped[Optional[int]] = mapped_column(SmallInteger, ForeignKey("merchant_category_codes.id"))
+    amount: Mapped[Decimal] = mapped_column(Numeric(18, 2))
+    external_id: Mapped[Optional[str]] = mapped_column(String(64))  # provider transaction id
+    extra: Mapped[Optional[dict]] = mapped_column(_Extra)
 
-    id = Column(Integer, primary_key=True)
-    card_id = Column(Integer, ForeignKey("cards.id", ondelete="CASCADE"), nullable=False)
-    invoice_id = Column(Integer, ForeignKey("card_invoices.id", ondelete="SET NULL"), nullable=True)
-    amount = Column(Numeric(18, 2), nullable=False)
-    currency = Column(String(3), nullable=False, default="BRL")
-    merchant_name = Column(String(255), nullable=True)
-    mcc = Column(String(8), nullable=True)
-    description = Column(Text, nullable=True)
-    transaction_date = Column(Date, nullable=False)
-    posting_date = Column(Date, nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    merchant_name = _extra_field("merchant_name")
+    description = _extra_field("description")
 
-    card = relationship("Card", back_populates="transactions")
-    invoice = relationship("CardInvoice", back_populates="transactions")
+    card: Mapped[Card] = relationship(back_populates="transactions")
+    invoice: Mapped[Optional[CardInvoice]] = relationship()
 
 
 class CreditContract(Base):
@@ -310,21 +754,30 @@ class CreditContract(Base):
     """
 
     __tablename__ = "credit_contracts"
+    __table_args__ = (
+        _enum_check("product_type", CreditProductType, name="ck_credit_product_type"),
+    )
 
-    id = Column(Integer, primary_key=True)
-    customer_id = Column(Integer, ForeignKey("customer_core.id", ondelete="CASCADE"), nullable=False)
-    product_type = Column(Enum(CreditProductType), nullable=False)
-    principal_amount = Column(Numeric(18, 2), nullable=False)
-    rate_nominal = Column(Numeric(10, 4), nullable=False)  # nominal CET
-    maturity_date = Column(Date, nullable=False)
-    installment_amount = Column(Numeric(18, 2), nullable=False)
-    balloon = Column(Boolean, nullable=False, default=False)
-    guarantee_type = Column(String(255), nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
-
-    customer = relationship("CustomerCore", back_populates="credit_contracts")
-    schedules = relationship("CreditSchedule", back_populates="contract", cascade="all, delete-orphan")
-    collaterals = relationship("Collateral", back_populates="contract", cascade="all, delete-orphan")
+    id: Mapped[int] = mapped_column(_BigId, Identity(always=False, cache=1000), primary_key=True)
+    customer_id: Mapped[int] = mapped_column(_BigId, ForeignKey("customer_core.id", ondelete="CASCADE"), index=True)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    maturity_date: Mapped[date] = mapped_column(Date)
+    balloon: Mapped[bool] = mapped_column(Boolean, default=False)
+    principal_amount: Mapped[Decimal] = mapped_column(Numeric(18, 2))
+    rate_nominal: Mapped[float] = mapped_column(Numeric(10, 4, asdecimal=False))  # nominal CET
+    installment_amount: Mapped[Decimal] = mapped_column(Numeric(18, 2))
+    product_type: Mapped[str] = mapped_column(String(16))  # CreditProductType
+    guarantee_type: Mapped[Optional[str]] = mapped_column(String(255))
+
+    customer: Mapped[CustomerCore] = relationship(back_populates="credit_contracts")
+    schedules: Mapped[list[CreditSchedule]] = relationship(
+        back_populates="contract",
+        cascade="save-update, merge, delete, delete-orphan",
+        passive_deletes=True,
+        lazy="selectin",
+    )
+    # Read-only view; collaterals are written through ``Collateral.contract``.
+    collaterals: Mapped[list[Collateral]] = relationship(viewonly=True, lazy="selectin")
 
 
 class CreditSchedule(Base):
@@ -336,17 +789,22 @@ class CreditSchedule(Base):
     """
 
     __tablename__ = "credit_schedules"
+    __table_args__ = (
+        Index("ix_credit_schedule_contract_due", "contract_id", "due_date"),
+        Index("ix_credit_schedule_customer_due", "customer_id", "due_date"),
+    )
 
-    id = Column(Integer, primary_key=True)
-    contract_id = Column(Integer, ForeignKey("credit_contracts.id", ondelete="CASCADE"), nullable=False)
-    installment_number = Column(Integer, nullable=False)
-    due_date = Column(Date, nullable=False)
-    installment_amount = Column(Numeric(18, 2), nullable=False)
-    paid_amount = Column(Numeric(18, 2), nullable=True)
-    status = Column(String(32), nullable=False, default="due")  # could be an enum in future
-    created_at = Column(DateTime, default=datetime.utcnow)
+    id: Mapped[int] = mapped_column(_BigId, Identity(always=False, cache=1000), primary_key=True)
+    contract_id: Mapped[int] = mapped_column(_BigId, ForeignKey("credit_contracts.id", ondelete="CASCADE"))
+    customer_id: Mapped[int] = mapped_column(_BigId, ForeignKey("customer_core.id", ondelete="CASCADE"))  # denormalised
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    due_date: Mapped[date] = mapped_column(Date)
+    installment_number: Mapped[int] = mapped_column(SmallInteger)
+    installment_amount: Mapped[Decimal] = mapped_column(Numeric(18, 2))
+    paid_amount: Mapped[Optional[Decimal]] = mapped_column(Numeric(18, 2))
+    status: Mapped[str] = mapped_column(String(32), default="due")  # could be an enum in future
 
-    contract = relationship("CreditContract", back_populates="schedules")
+    contract: Mapped[CreditContract] = relationship(back_populates="schedules")
 
 
 class Collateral(Base):
@@ -359,14 +817,14 @@ class Collateral(Base):
 
     __tablename__ = "collaterals"
 
-    id = Column(Integer, primary_key=True)
-    contract_id = Column(Integer, ForeignKey("credit_contracts.id", ondelete="CASCADE"), nullable=False)
-    collateral_type = Column(String(255), nullable=False)
-    collateral_value = Column(Numeric(18, 2), nullable=False)
-    description = Column(Text, nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    id: Mapped[int] = mapped_column(_BigId, Identity(always=False, cache=1000), primary_key=True)
+    contract_id: Mapped[int] = mapped_column(_BigId, ForeignKey("credit_contracts.id", ondelete="CASCADE"), index=True)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    collateral_value: Mapped[Decimal] = mapped_column(Numeric(18, 2))
+    collateral_type: Mapped[str] = mapped_column(String(255))
+    description: Mapped[Optional[str]] = mapped_column(Text)
 
-    contract = relationship("CreditContract", back_populates="collaterals")
+    contract: Mapped[CreditContract] = relationship()
 
 
 class PositionFund(Base):
@@ -377,16 +835,16 @@ class PositionFund(Base):
 
     __tablename__ = "positions_funds"
 
-    id = Column(Integer, primary_key=True)
-    customer_id = Column(Integer, ForeignKey("customer_core.id", ondelete="CASCADE"), nullable=False)
-    fund_cnpj = Column(String(20), nullable=False)
-    quantity = Column(Numeric(20, 8), nullable=False)
-    avg_price = Column(Numeric(18, 4), nullable=False)
-    mark_to_market = Column(Numeric(18, 4), nullable=True)
-    liquidity_bucket = Column(String(32), nullable=True)
-    last_event = Column(Date, nullable=True)
+    id: Mapped[int] = mapped_column(_BigId, Identity(always=False, cache=1000), primary_key=True)
+    customer_id: Mapped[int] = mapped_column(_BigId, ForeignKey("customer_core.id", ondelete="CASCADE"), index=True)
+    last_event: Mapped[Optional[date]] = mapped_column(Date)
+    quantity: Mapped[Decimal] = mapped_column(Numeric(20, 8))
+    avg_price: Mapped[float] = mapped_column(Numeric(18, 4, asdecimal=False))
+    mark_to_market: Mapped[Optional[float]] = mapped_column(Numeric(18, 4, asdecimal=False))
+    fund_cnpj: Mapped[str] = mapped_column(String(20))
+    liquidity_bucket: Mapped[Optional[str]] = mapped_column(String(32))
 
-    customer = relationship("CustomerCore", back_populates="investment_positions")
+    customer: Mapped[CustomerCore] = relationship(back_populates="investment_positions")
 
 
 class PositionFixedIncome(Base):
@@ -394,17 +852,17 @@ class PositionFixedIncome(Base):
 
     __tablename__ = "positions_fixed_income"
 
-    id = Column(Integer, primary_key=True)
-    customer_id = Column(Integer, ForeignKey("customer_core.id", ondelete="CASCADE"), nullable=False)
-    instrument_id = Column(String(64), nullable=False)  # e.g. CDB, LCI, LCA code
-    quantity = Column(Numeric(20, 8), nullable=False)
-    avg_price = Column(Numeric(18, 4), nullable=False)
-    mark_to_market = Column(Numeric(18, 4), nullable=True)
-    liquidity_bucket = Column(String(32), nullable=True)
-    maturity_date = Column(Date, nullable=True)
-    last_event = Column(Date, nullable=True)
+    id: Mapped[int] = mapped_column(_BigId, Identity(always=False, cache=1000), primary_key=True)
+    customer_id: Mapped[int] = mapped_column(_BigId, ForeignKey("customer_core.id", ondelete="CASCADE"), index=True)
+    maturity_date: Mapped[Optional[date]] = mapped_column(Date)
+    last_event: Mapped[Optional[date]] = mapped_column(Date)
+    quantity: Mapped[Decimal] = mapped_column(Numeric(20, 8))
+    avg_price: Mapped[float] = mapped_column(Numeric(18, 4, asdecimal=False))
+    mark_to_market: Mapped[Optional[float]] = mapped_column(Numeric(18, 4, asdecimal=False))
+    instrument_id: Mapped[str] = mapped_column(String(64))  # e.g. CDB, LCI, LCA code
+    liquidity_bucket: Mapped[Optional[str]] = mapped_column(String(32))
 
-    customer = relationship("CustomerCore")
+    customer: Mapped[CustomerCore] = relationship()
 
 
 class PositionEquity(Base):
@@ -412,16 +870,16 @@ class PositionEquity(Base):
 
     __tablename__ = "positions_equity"
 
-    id = Column(Integer, primary_key=True)
-    customer_id = Column(Integer, ForeignKey("customer_core.id", ondelete="CASCADE"), nullable=False)
-    ticker = Column(String(10), nullable=False)
-    quantity = Column(Numeric(20, 8), nullable=False)
-    avg_price = Column(Numeric(18, 4), nullable=False)
-    mark_to_market = Column(Numeric(18, 4), nullable=True)
-    liquidity_bucket = Column(String(32), nullable=True)
-    last_event = Column(Date, nullable=True)
+    id: Mapped[int] = mapped_column(_BigId, Identity(always=False, cache=1000), primary_key=True)
+    customer_id: Mapped[int] = mapped_column(_BigId, ForeignKey("customer_core.id", ondelete="CASCADE"), index=True)
+    last_event: Mapped[Optional[date]] = mapped_column(Date)
+    quantity: Mapped[Decimal] = mapped_column(Numeric(20, 8))
+    avg_price: Mapped[float] = mapped_column(Numeric(18, 4, asdecimal=False))
+    mark_to_market: Mapped[Optional[float]] = mapped_column(Numeric(18, 4, asdecimal=False))
+    ticker: Mapped[str] = mapped_column(String(10))
+    liquidity_bucket: Mapped[Optional[str]] = mapped_column(String(32))
 
-    customer = relationship("CustomerCore")
+    customer: Mapped[CustomerCore] = relationship()
 
 
 class PositionTreasury(Base):
@@ -429,20 +887,20 @@ class PositionTreasury(Base):
 
     __tablename__ = "positions_treasury"
 
-    id = Column(Integer, primary_key=True)
-    customer_id = Column(Integer, ForeignKey("customer_core.id", ondelete="CASCADE"), nullable=False)
-    instrument_id = Column(String(64), nullable=False)  # e.g. TNM2027
-    quantity = Column(Numeric(20, 8), nullable=False)
-    avg_price = Column(Numeric(18, 4), nullable=False)
-    mark_to_market = Column(Numeric(18, 4), nullable=True)
-    liquidity_bucket = Column(String(32), nullable=True)
-    maturity_date = Column(Date, nullable=True)
-    last_event = Column(Date, nullable=True)
+    id: Mapped[int] = mapped_column(_BigId, Identity(always=False, cache=1000), primary_key=True)
+    customer_id: Mapped[int] = mapped_column(_BigId, ForeignKey("customer_core.id", ondelete="CASCADE"), index=True)
+    maturity_date: Mapped[Optional[date]] = mapped_column(Date)
+    last_event: Mapped[Optional[date]] = mapped_column(Date)
+    quantity: Mapped[Decimal] = mapped_column(Numeric(20, 8))
+    avg_price: Mapped[float] = mapped_column(Numeric(18, 4, asdecimal=False))
+    mark_to_market: Mapped[Optional[float]] = mapped_column(Numeric(18, 4, asdecimal=False))
+    instrument_id: Mapped[str] = mapped_column(String(64))  # e.g. TNM2027
+    liquidity_bucket: Mapped[Optional[str]] = mapped_column(String(32))
 
-    customer = relationship("CustomerCore")
+    customer: Mapped[CustomerCore] = relationship()
 
 
-class InvestmentMovement(Base):
+class InvestmentMovement(_CurrencyCode, Base):
     """Movement (transaction) affecting an investment position.
 
     Represents buy/sell orders, reinvestments and other events that change
@@ -451,19 +909,28 @@ class InvestmentMovement(Base):
     """
 
     __tablename__ = "investment_movements"
+    __table_args__ = (
+        Index("ix_investment_movement_customer_date", "customer_id", "transaction_date"),
+        UniqueConstraint("external_id", "transaction_date", name="uix_investment_movement_external"),
+        {"postgresql_partition_by": "RANGE (transaction_date)"},
+    )
 
-    id = Column(Integer, primary_key=True)
-    customer_id = Column(Integer, ForeignKey("customer_core.id", ondelete="CASCADE"), nullable=False)
-    instrument_id = Column(String(64), nullable=False)
-    movement_type = Column(String(32), nullable=False)  # e.g. buy, sell, dividend
-    quantity = Column(Numeric(20, 8), nullable=False)
-    price = Column(Numeric(18, 4), nullable=False)
-    amount = Column(Numeric(18, 2), nullable=False)
-    transaction_date = Column(Date, nullable=False)
-    settlement_date = Column(Date, nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    id: Mapped[int] = mapped_column(_BigId, Identity(always=False, cache=1000), primary_key=True, autoincrement=True)
+    customer_id: Mapped[int] = mapped_column(_BigId, ForeignKey("customer_core.id", ondelete="CASCADE"))
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    transaction_date: Mapped[date] = mapped_column(Date, primary_key=True)
+    settlement_date: Mapped[Optional[date]] = mapped_column(Date)
+    currency_id: Mapped[int] = mapped_column(
+        SmallInteger, ForeignKey("currencies.id"), server_default=text(str(DEFAULT_CURRENCY_ID))
+    )
+    quantity: Mapped[Decimal] = mapped_column(Numeric(20, 8))
+    price: Mapped[Decimal] = mapped_column(Numeric(18, 4))
+    amount: Mapped[Decimal] = mapped_column(Numeric(18, 2))
+    instrument_id: Mapped[str] = mapped_column(String(64))
+    movement_type: Mapped[str] = mapped_column(String(32))  # e.g. buy, sell, dividend
+    external_id: Mapped[Optional[str]] = mapped_column(String(64))  # provider transaction id
 
-    customer = relationship("CustomerCore")
+    customer: Mapped[CustomerCore] = relationship()
 
 
 class FxOperation(Base):
@@ -476,16 +943,16 @@ class FxOperation(Base):
 
     __tablename__ = "fx_operations"
 
-    id = Column(Integer, primary_key=True)
-    customer_id = Column(Integer, ForeignKey("customer_core.id", ondelete="CASCADE"), nullable=False)
-    currency_pair = Column(String(10), nullable=False)  # e.g. USD/BRL
-    notional = Column(Numeric(18, 2), nullable=False)
-    nature = Column(String(32), nullable=False)  # purchase, sale
-    settlement_date = Column(Date, nullable=False)
-    rate = Column(Numeric(10, 6), nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    id: Mapped[int] = mapped_column(_BigId, Identity(always=False, cache=1000), primary_key=True)
+    customer_id: Mapped[int] = mapped_column(_BigId, ForeignKey("customer_core.id", ondelete="CASCADE"), index=True)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    settlement_date: Mapped[date] = mapped_column(Date)
+    notional: Mapped[Decimal] = mapped_column(Numeric(18, 2))
+    rate: Mapped[Optional[float]] = mapped_column(Numeric(10, 6, asdecimal=False))
+    currency_pair: Mapped[str] = mapped_column(String(10))  # e.g. USD/BRL
+    nature: Mapped[str] = mapped_column(String(32))  # purchase, sale
 
-    customer = relationship("CustomerCore", back_populates="fx_operations")
+    customer: Mapped[CustomerCore] = relationship(back_populates="fx_operations")
 
 
 class Consent(Base):
@@ -497,15 +964,20 @@ class Consent(Base):
 
     __tablename__ = "consents"
 
-    id = Column(Integer, primary_key=True)
-    customer_id = Column(Integer, ForeignKey("customer_core.id", ondelete="CASCADE"), nullable=False)
-    granted_at = Column(DateTime, nullable=False, default=datetime.utcnow)
-    expires_at = Column(DateTime, nullable=True)
-    revoked_at = Column(DateTime, nullable=True)
-    description = Column(Text, nullable=True)
-
-    customer = relationship("CustomerCore", back_populates="consents")
-    scopes = relationship("ConsentScope", back_populates="consent", cascade="all, delete-orphan")
+    id: Mapped[int] = mapped_column(_BigId, Identity(always=False, cache=1000), primary_key=True)
+    customer_id: Mapped[int] = mapped_column(_BigId, ForeignKey("customer_core.id", ondelete="CASCADE"), index=True)
+    granted_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    expires_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
+    revoked_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
+    description: Mapped[Optional[str]] = mapped_column(Text)
+
+    customer: Mapped[CustomerCore] = relationship(back_populates="consents")
+    # One-way: scopes are always reached through their consent.
+    scopes: Mapped[list[ConsentScope]] = relationship(
+        cascade="save-update, merge, delete, delete-orphan",
+        passive_deletes=True,
+        lazy="selectin",
+    )
 
 
 class ConsentScope(Base):
@@ -518,15 +990,13 @@ class ConsentScope(Base):
 
     __tablename__ = "consent_scopes"
 
-    id = Column(Integer, primary_key=True)
-    consent_id = Column(Integer, ForeignKey("consents.id", ondelete="CASCADE"), nullable=False)
-    scope = Column(String(32), nullable=False)  # accounts, credit, investments, etc.
-    created_at = Column(DateTime, default=datetime.utcnow)
-
-    consent = relationship("Consent", back_populates="scopes")
+    id: Mapped[int] = mapped_column(_BigId, Identity(always=False, cache=1000), primary_key=True)
+    consent_id: Mapped[int] = mapped_column(_BigId, ForeignKey("consents.id", ondelete="CASCADE"), index=True)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    scope: Mapped[str] = mapped_column(String(32))  # accounts, credit, investments, etc.
 
 
-class PaymentOrder(Base):
+class PaymentOrder(_CurrencyCode, Base):
     """Payment order initiated via Open Finance (e.g. PIX).
 
     Represents an order to transfer funds initiated by the customer through
@@ -535,15 +1005,101 @@ class PaymentOrder(Base):
     """
 
     __tablename__ = "payment_orders"
+    __table_args__ = (
+        _enum_check("status", PaymentStatus, name="ck_payment_order_status"),
+        UniqueConstraint("pix_e2e_id", name="uix_payment_order_pix_e2e"),
+    )
 
-    id = Column(Integer, primary_key=True)
-    customer_id = Column(Integer, ForeignKey("customer_core.id", ondelete="CASCADE"), nullable=False)
-    amount = Column(Numeric(18, 2), nullable=False)
-    currency = Column(String(3), nullable=False, default="BRL")
-    scope = Column(String(32), nullable=False)  # accounts, credit, investments, etc.
-    pix_e2e_id = Column(String(50), nullable=True)
-    status = Column(Enum(PaymentStatus), nullable=False, default=PaymentStatus.PENDING)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    completed_at = Column(DateTime, nullable=True)
-
-    customer = relationship("CustomerCore", back_populates="payment_orders")
+    id: Mapped[int] = mapped_column(_BigId, Identity(always=False, cache=1000), primary_key=True)
+    customer_id: Mapped[int] = mapped_column(_BigId, ForeignKey("customer_core.id", ondelete="CASCADE"), index=True)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    completed_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
+    currency_id: Mapped[int] = mapped_column(
+        SmallInteger, ForeignKey("currencies.id"), server_default=text(str(DEFAULT_CURRENCY_ID))
+    )
+    amount: Mapped[Decimal] = mapped_column(Numeric(18, 2))
+    scope: Mapped[str] = mapped_column(String(32))  # accounts, credit, investments, etc.
+    pix_e2e_id: Mapped[Optional[str]] = mapped_column(String(50))
+    status: Mapped[str] = mapped_column(String(16), server_default=PaymentStatus.PENDING.value, index=True)  # PaymentStatus
+
+    customer: Mapped[CustomerCore] = relationship(back_populates="payment_orders")
+
+
+def _copy_customer_id(parent: str):
+    """Return a ``before_insert`` hook filling ``customer_id`` from ``parent``."""
+
+    def before_insert(mapper, connection, target) -> None:
+        if target.customer_id is not None:
+            return
+        owner = getattr(target, parent)
+        if owner is not None:
+            target.customer_id = owner.customer_id
+            return
+        # Only the foreign key was set (e.g. ``account_id=...``): read the
+        # parent's customer_id, at the cost of one query per row.
+        relationship_ = mapper.relationships[parent]
+        ((local, remote),) = relationship_.local_remote_pairs
+        parent_id = getattr(target, mapper.get_property_by_column(local).key)
+        if parent_id is not None:
+            target.customer_id = connection.scalar(
+                select(relationship_.mapper.c.customer_id).where(remote == parent_id)
+            )
+
+    return before_insert
+
+
+@event.listens_for(Currency.__table__, "after_create")
+def _seed_currencies(target, connection, **kw) -> None:
+    connection.execute(
+        insert(Currency),
+        [{"id": number, "code": code} for number, code in ISO_4217_CURRENCIES],
+    )
+
+
+# ``customer_id`` is denormalised onto these leaf tables so customer-scoped
+# queries avoid joining through their parent. Objects flushed through the
+# ORM inherit it from the parent object, or from the parent row when only
+# the foreign key is set; bulk inserts must supply it explicitly.
+for _model, _parent in (
+    (AccountTransaction, "account"),
+    (CardInvoice, "card"),
+    (CardTransaction, "card"),
+    (CreditSchedule, "contract"),
+):
+    event.listen(_model, "before_insert", _copy_customer_id(_parent))
+del _model, _parent
+
+# Prebuilt ``INSERT`` constructs for the high-volume ingestion tables, reused
+# by ``bulk_insert`` instead of building a new statement on every call.
+for _model in (
+    AccountBalance,
+    AccountTransaction,
+    CardTransaction,
+    CreditSchedule,
+    InvestmentMovement,
+    PositionFund,
+    PositionFixedIncome,
+    PositionEquity,
+    PositionTreasury,
+):
+    _model._INSERT = insert(_model)
+del _model
+
+# PostgreSQL TOAST storage: transaction ``extra`` payloads are short and
+# preferably kept inline in the heap row (MAIN, which still compresses them
+# and moves them out of line only when the row would not otherwise fit);
+# consent descriptions are occasionally long and stored out of line
+# uncompressed (EXTERNAL) to avoid decompression on every fetch.
+for _model, _column, _storage in (
+    (AccountTransaction, "extra", "MAIN"),
+    (CardTransaction, "extra", "MAIN"),
+    (Consent, "description", "EXTERNAL"),
+):
+    event.listen(
+        _model.__table__,
+        "after_create",
+        DDL(
+            f"ALTER TABLE {_model.__tablename__} ALTER COLUMN {_column} SET STORAGE {_storage}"
+        ).execute_if(dialect="postgresql"),
+    )
+del _model, _column, _storage
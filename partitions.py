@@ -0,0 +1,114 @@
+"""
+Monthly partition maintenance for the Protege.ai time series tables.
+
+On PostgreSQL, ``account_balances``, ``account_transactions``,
+``card_transactions`` and ``investment_movements`` are declared with
+``PARTITION BY RANGE`` on their date column (see :mod:`protege_ai.models`).
+A partitioned table stores no rows itself, so a partition covering each
+month must exist before data for that month is inserted. Old months are
+removed with ``DETACH PARTITION`` followed by ``DROP TABLE`` instead of a
+row-by-row ``DELETE``.
+
+The helpers below are intended to be run periodically (e.g. from a cron
+job) ahead of the ingestion window:
+
+.. code-block:: python
+
+   from datetime import date
+   from protege_ai import create_engine
+   from protege_ai.partitions import create_monthly_partitions
+
+   engine = create_engine("postgresql+psycopg2://...")
+   with engine.begin() as conn:
+       create_monthly_partitions(conn, date(2024, 1, 1), months=24)
+
+Running the module directly creates partitions for the current month and
+the following ones: ``python -m protege_ai.partitions URL [MONTHS]``.
+"""
+
+from __future__ import annotations
+
+import sys
+from datetime import date
+from typing import Iterable, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from .models import AccountBalance, AccountTransaction, CardTransaction, InvestmentMovement
+
+
+PARTITIONED_TABLES = tuple(
+    model.__tablename__
+    for model in (AccountBalance, AccountTransaction, CardTransaction, InvestmentMovement)
+)
+
+
+def _month_start(day: date, offset: int = 0) -> date:
+    """Return the first day of the month ``offset`` months after ``day``."""
+
+    index = day.year * 12 + day.month - 1 + offset
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    """Return the name of the partition of ``table`` holding ``month``."""
+
+    return f"{table}_{month:%Y%m}"
+
+
+def create_partition_ddl(table: str, month: date) -> str:
+    """Return the DDL creating the partition of ``table`` for ``month``."""
+
+    start = _month_start(month)
+    end = _month_start(month, 1)
+    return (
+        f"CREATE TABLE IF NOT EXISTS {partition_name(table, start)} "
+        f"PARTITION OF {table} FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+    )
+
+
+def create_monthly_partitions(
+    conn: Connection,
+    start: date,
+    months: int,
+    tables: Iterable[str] = PARTITIONED_TABLES,
+) -> None:
+    """Create ``months`` consecutive monthly partitions beginning at ``start``.
+
+    Existing partitions are left untouched, so the function is safe to run
+    repeatedly.
+    """
+
+    for table in tables:
+        for offset in range(months):
+            conn.execute(text(create_partition_ddl(table, _month_start(start, offset))))
+
+
+def detach_partition(conn: Connection, table: str, month: date, drop: bool = False) -> None:
+    """Detach the partition of ``table`` for ``month`` and optionally drop it."""
+
+    name = partition_name(table, _month_start(month))
+    conn.execute(text(f"ALTER TABLE {table} DETACH PARTITION {name}"))
+    if drop:
+        conn.execute(text(f"DROP TABLE {name}"))
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """Create partitions for the current month and the following ones."""
+
+    from .engine import create_engine
+
+    args = sys.argv[1:] if argv is None else argv
+    if not args:
+        print("usage: python -m protege_ai.partitions URL [MONTHS]", file=sys.stderr)
+        return 2
+    months = int(args[1]) if len(args) > 1 else 3
+    engine = create_engine(args[0])
+    with engine.begin() as conn:
+        create_monthly_partitions(conn, date.today(), months)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
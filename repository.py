@@ -0,0 +1,285 @@
+"""
+Repository helpers for the Protege.ai platform.
+
+The helpers in this module operate on an existing SQLAlchemy ``Session``
+and never commit; transaction boundaries are left to the caller.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Iterable, Mapping, Optional, Sequence
+
+from sqlalchemy import Row, event, func, inspect, insert, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.hybrid import hybrid_property
+from sqlalchemy.orm import Session, object_session
+
+from .models import CustomerCore, MerchantCategoryCode
+
+
+CUSTOMER_CACHE_TTL = 60.0
+CUSTOMER_CACHE_SIZE = 10_000
+
+# Dialect-specific ``INSERT`` constructs supporting ``ON CONFLICT DO NOTHING``.
+_CONFLICT_INSERTS = {"postgresql": pg_insert, "sqlite": sqlite_insert}
+
+
+def bulk_insert(
+    session: Session,
+    model: type,
+    rows: Iterable[Mapping[str, Any]],
+    ignore_conflicts: bool = False,
+    return_ids: bool = False,
+) -> Optional[Sequence[Row]]:
+    """Insert many rows of ``model`` in as few statements as possible.
+
+    Rows are plain dictionaries keyed by column attribute name. Keys naming
+    a writable hybrid (``currency``, ``mcc``, ``description``,
+    ``merchant_name``) are folded into the columns behind it
+    (``currency_id``, ``mcc_id``, ``extra``) before the statement is
+    executed, since bulk ``INSERT`` only accepts column values. Rows are
+    sent with a single ``session.execute(insert(model), rows)`` call, which
+    SQLAlchemy batches with ``insertmanyvalues`` instead of flushing one
+    ORM object at a time. High-volume models carry a prebuilt ``_INSERT``
+    construct which is reused here.
+
+    When ``ignore_conflicts`` is true, the statement is emitted as
+    ``INSERT ... ON CONFLICT DO NOTHING`` so retried ingests are idempotent.
+    This is supported on PostgreSQL and SQLite; other dialects raise
+    ``ValueError``.
+
+    When ``return_ids`` is true, the generated primary keys are fetched
+    with ``INSERT ... RETURNING`` in the same round trips and returned in
+    the order of ``rows``. Combined with ``ignore_conflicts``, rows skipped
+    by the database return nothing and the order is not guaranteed.
+    """
+
+    rows = _apply_hybrids(model, rows)
+    if not rows:
+        return [] if return_ids else None
+    if ignore_conflicts:
+        dialect = session.get_bind(mapper=model).dialect.name
+        if dialect not in _CONFLICT_INSERTS:
+            raise ValueError(f"ignore_conflicts is not supported on {dialect}")
+        stmt = _CONFLICT_INSERTS[dialect](model).on_conflict_do_nothing()
+    else:
+        stmt = getattr(model, "_INSERT", None)
+        if stmt is None:
+            stmt = insert(model)
+    if return_ids:
+        stmt = stmt.returning(*inspect(model).primary_key, sort_by_parameter_order=not ignore_conflicts)
+        return session.execute(stmt, rows).all()
+    session.execute(stmt, rows)
+    return None
+
+
+class _RowValues(dict):
+    """Row dictionary exposing its keys as attributes to hybrid setters."""
+
+    def __getattr__(self, key: str) -> Any:
+        return self.get(key)
+
+    def __setattr__(self, key: str, value: Any) -> None:
+        self[key] = value
+
+
+def _apply_hybrids(model: type, rows: Iterable[Mapping[str, Any]]) -> list[Mapping[str, Any]]:
+    """Replace hybrid attribute keys in ``rows`` by the columns they set."""
+
+    hybrids = {
+        key: attr.fset
+        for key, attr in inspect(model).all_orm_descriptors.items()
+        if isinstance(attr, hybrid_property) and attr.fset is not None
+    }
+    if not hybrids:
+        return list(rows)
+    result = []
+    for row in rows:
+        if hybrids.keys().isdisjoint(row):
+            result.append(row)
+            continue
+        values = _RowValues((key, value) for key, value in row.items() if key not in hybrids)
+        for key, value in row.items():
+            if key in hybrids:
+                hybrids[key](values, value)
+        result.append(dict(values))
+    return result
+
+
+def reserve_ids(session: Session, model: type, count: int) -> list[int]:
+    """Allocate ``count`` primary key values for ``model`` in one round trip.
+
+    The values are drawn from the identity sequence behind ``model.id``
+    with ``SELECT nextval(...) FROM generate_series(1, count)``. Rows can
+    then be sent to :func:`bulk_insert` with their ids already filled in,
+    so no ``RETURNING`` is needed to correlate them with child rows. The
+    ids are consumed even if the transaction rolls back.
+
+    Only PostgreSQL is supported; other dialects raise ``ValueError``.
+    """
+
+    dialect = session.get_bind(mapper=model).dialect.name
+    if dialect != "postgresql":
+        raise ValueError(f"reserve_ids is not supported on {dialect}")
+    if count <= 0:
+        return []
+    sequence = func.pg_get_serial_sequence(model.__tablename__, "id")
+    stmt = select(func.nextval(sequence)).select_from(func.generate_series(1, count))
+    return list(session.scalars(stmt))
+
+
+def register_merchant_category_codes(
+    session: Session,
+    codes: Mapping[str, Optional[str]],
+) -> None:
+    """Make sure every MCC in ``codes`` exists in the dimension table.
+
+    ``codes`` maps four-digit MCCs to an optional description. Codes that
+    are already registered are left untouched, so ingestion can call this
+    with the MCCs of each batch before inserting its transactions.
+    """
+
+    wanted = {int(code): (code, description) for code, description in codes.items()}
+    if not wanted:
+        return
+    existing = set(
+        session.scalars(select(MerchantCategoryCode.id).where(MerchantCategoryCode.id.in_(wanted)))
+    )
+    rows = [
+        {"id": mcc_id, "code": code, "description": description}
+        for mcc_id, (code, description) in wanted.items()
+        if mcc_id not in existing
+    ]
+    if rows:
+        session.execute(insert(MerchantCategoryCode), rows)
+
+
+# tax_id -> (customer primary key, expiry). Only the integer key is cached,
+# never the ORM object, so callers always receive an instance bound to
+# their own session.
+_customer_ids: OrderedDict[str, tuple[int, float]] = OrderedDict()
+_customer_ids_lock = threading.Lock()
+
+
+def _cached_customer_id(tax_id: str) -> Optional[int]:
+    with _customer_ids_lock:
+        entry = _customer_ids.get(tax_id)
+        if entry is None:
+            return None
+        if entry[1] < time.monotonic():
+            del _customer_ids[tax_id]
+            return None
+        _customer_ids.move_to_end(tax_id)
+        return entry[0]
+
+
+def _cache_customer_id(tax_id: str, customer_id: int) -> None:
+    with _customer_ids_lock:
+        _customer_ids[tax_id] = (customer_id, time.monotonic() + CUSTOMER_CACHE_TTL)
+        _customer_ids.move_to_end(tax_id)
+        while len(_customer_ids) > CUSTOMER_CACHE_SIZE:
+            _customer_ids.popitem(last=False)
+
+
+def invalidate_customer_cache(tax_id: Optional[str] = None) -> None:
+    """Drop the cached id for ``tax_id``, or the whole cache if omitted."""
+
+    with _customer_ids_lock:
+        if tax_id is None:
+            _customer_ids.clear()
+        else:
+            _customer_ids.pop(tax_id, None)
+
+
+def get_customer_id_by_tax_id(session: Session, tax_id: str) -> Optional[int]:
+    """Return the primary key of the customer identified by ``tax_id``.
+
+    Every API request resolves the customer by tax id, so the mapping from
+    tax id to primary key is kept in a per-process cache for
+    ``CUSTOMER_CACHE_TTL`` seconds and a hit issues no query at all. A
+    miss selects only ``customer_core.id``. Entries are invalidated when a
+    customer is updated or deleted through the ORM; changes made by other
+    processes or by bulk ``UPDATE``/``DELETE`` statements are picked up
+    once the entry expires.
+
+    The lookup runs in the caller's transaction, so it can see customers
+    that are not committed yet. Those flushed through the ORM in the
+    current transaction are not cached until it commits, since other
+    threads must not receive an id that may be rolled back; rows inserted
+    with Core statements are not tracked and should be looked up only
+    after commit.
+
+    The returned id is enough to filter the denormalised ``customer_id``
+    columns of transactions, invoices and schedules without loading the
+    customer.
+    """
+
+    customer_id = _cached_customer_id(tax_id)
+    if customer_id is not None:
+        return customer_id
+    customer_id = session.scalars(select(CustomerCore.id).where(CustomerCore.tax_id == tax_id)).one_or_none()
+    if customer_id is not None and tax_id not in session.info.get(_UNCOMMITTED_TAX_IDS, ()):
+        _cache_customer_id(tax_id, customer_id)
+    return customer_id
+
+
+def get_customer_by_tax_id(
+    session: Session,
+    tax_id: str,
+    options: Sequence[Any] = (),
+) -> Optional[CustomerCore]:
+    """Return the customer identified by ``tax_id``, or ``None``.
+
+    The tax id is resolved through the same cache as
+    :func:`get_customer_id_by_tax_id`. A hit becomes a primary key
+    ``session.get()``, which is answered from the identity map when the
+    customer is already present in the session. Otherwise loading the
+    object also loads its ``selectin`` collections (accounts, cards,
+    contracts, positions, ...), one query each; pass ``options`` such as
+    ``models.default_options()`` to skip them, or use
+    :func:`get_customer_id_by_tax_id` when only the id is needed.
+    """
+
+    customer_id = _cached_customer_id(tax_id)
+    if customer_id is not None:
+        customer = session.get(CustomerCore, customer_id, options=options)
+        if customer is not None and customer.tax_id == tax_id:
+            return customer
+        invalidate_customer_cache(tax_id)
+
+    stmt = select(CustomerCore).where(CustomerCore.tax_id == tax_id).options(*options)
+    customer = session.scalars(stmt).one_or_none()
+    if customer is not None and tax_id not in session.info.get(_UNCOMMITTED_TAX_IDS, ()):
+        _cache_customer_id(tax_id, customer.id)
+    return customer
+
+
+# ``Session.info`` key holding the tax ids inserted or assigned by the
+# session's current transaction; they are not cached until it commits.
+_UNCOMMITTED_TAX_IDS = "protege_ai.uncommitted_tax_ids"
+
+
+@event.listens_for(CustomerCore, "after_insert")
+@event.listens_for(CustomerCore, "after_update")
+def _track_uncommitted_customer(mapper, connection, target: CustomerCore) -> None:
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(_UNCOMMITTED_TAX_IDS, set()).add(target.tax_id)
+
+
+@event.listens_for(Session, "after_commit")
+@event.listens_for(Session, "after_rollback")
+def _forget_uncommitted_customers(session: Session) -> None:
+    session.info.pop(_UNCOMMITTED_TAX_IDS, None)
+
+
+@event.listens_for(CustomerCore, "after_update")
+@event.listens_for(CustomerCore, "after_delete")
+def _invalidate_customer(mapper, connection, target: CustomerCore) -> None:
+    invalidate_customer_cache(target.tax_id)
+    for old_tax_id in inspect(target).attrs.tax_id.history.deleted:
+        invalidate_customer_cache(old_tax_id)
@@ -0,0 +1,60 @@
+"""Shared fixtures for the Protege.ai test suite.
+
+The repository root is the ``protege_ai`` package itself, so it is loaded
+under that name before the tests import it.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import pathlib
+import sys
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+
+if "protege_ai" not in sys.modules:
+    _spec = importlib.util.spec_from_file_location(
+        "protege_ai", ROOT / "__init__.py", submodule_search_locations=[str(ROOT)]
+    )
+    _module = importlib.util.module_from_spec(_spec)
+    sys.modules["protege_ai"] = _module
+    _spec.loader.exec_module(_module)
+
+from protege_ai import Base  # noqa: E402
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+
+    @event.listens_for(engine, "connect")
+    def _enable_foreign_keys(dbapi_connection, connection_record):
+        dbapi_connection.execute("PRAGMA foreign_keys=ON")
+
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def session(engine):
+    with Session(engine) as session:
+        yield session
+
+
+@pytest.fixture
+def statements(engine):
+    """List of SQL statements executed on ``engine`` while the test runs."""
+
+    executed: list[str] = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _record)
+    yield executed
+    event.remove(engine, "before_cursor_execute", _record)
@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+from datetime import date
+
+import pytest
+from sqlalchemy import PrimaryKeyConstraint, UniqueConstraint, delete, func, insert, select
+from sqlalchemy.dialects import postgresql
+
+from protege_ai import (
+    Base,
+    Account,
+    AccountBalance,
+    AccountTransaction,
+    Card,
+    CardInvoice,
+    CardTransaction,
+    CustomerCore,
+    InvestmentMovement,
+    PaymentOrder,
+    default_options,
+    register_merchant_category_codes,
+)
+
+
+@pytest.mark.parametrize(
+    "model", [AccountBalance, AccountTransaction, CardTransaction, InvestmentMovement]
+)
+def test_partitioned_tables_have_insert_sentinel(model):
+    # Without a sentinel, PostgreSQL falls back to one INSERT per row for
+    # ordered ``INSERT ... RETURNING``.
+    date_column = next(c.key for c in model.__table__.primary_key if c.key != "id")
+    stmt = insert(model).returning(model.id, sort_by_parameter_order=True)
+    compiled = stmt.compile(
+        dialect=postgresql.psycopg2.dialect(), column_keys=[date_column], for_executemany=True
+    )
+    assert compiled._insertmanyvalues.sentinel_columns == (model.__table__.c.id,)
+
+
+
+def test_customer_id_copied_from_parent_foreign_key(session):
+    customer = CustomerCore(tax_id="1")
+    account = Account(customer=customer, account_type="checking")
+    card = Card(customer=customer, card_number="1", product_type="credit")
+    session.add_all([account, card])
+    session.commit()
+
+    transactions = [
+        AccountTransaction(id=1, account_id=account.id, amount=1, posting_date=date(2024, 1, 2)),
+        CardTransaction(id=1, card_id=card.id, amount=1, transaction_date=date(2024, 1, 2)),
+    ]
+    session.add_all(transactions)
+    session.flush()
+    assert [t.customer_id for t in transactions] == [customer.id, customer.id]
+
+
+def test_foreign_keys_are_indexed():
+    # Selectin loads and ON DELETE actions filter on every foreign key.
+    unindexed = []
+    for table in Base.metadata.sorted_tables:
+        leading = {index.columns[0] for index in table.indexes}
+        leading.update(
+            constraint.columns[0]
+            for constraint in table.constraints
+            if isinstance(constraint, (PrimaryKeyConstraint, UniqueConstraint))
+        )
+        for fk in table.foreign_keys:
+            if fk.parent not in leading and fk.column.table.name not in ("currencies", "merchant_category_codes"):
+                unindexed.append(str(fk.parent))
+    assert unindexed == []
+
+
+def test_extra_field_equality_uses_jsonb_containment():
+    stmt = select(CardTransaction.id).where(CardTransaction.merchant_name == "Acme")
+    sql = str(stmt.compile(dialect=postgresql.dialect()))
+    assert "card_transactions.extra @> jsonb_build_object('merchant_name', " in sql
+
+
+def test_extra_field_filters(session):
+    card = Card(customer=CustomerCore(tax_id="1"), card_number="1", product_type="credit")
+    session.add_all(
+        [
+            CardTransaction(id=1, card=card, amount=1, transaction_date=date(2024, 1, 2), merchant_name="A"),
+            CardTransaction(id=2, card=card, amount=1, transaction_date=date(2024, 1, 2), merchant_name="B"),
+            CardTransaction(id=3, card=card, amount=1, transaction_date=date(2024, 1, 2)),
+        ]
+    )
+    session.commit()
+
+    def ids(criterion):
+        return session.scalars(select(CardTransaction.id).where(criterion).order_by(CardTransaction.id)).all()
+
+    assert ids(CardTransaction.merchant_name == "A") == [1]
+    assert ids(CardTransaction.merchant_name == "B") == [2]
+    assert ids(CardTransaction.merchant_name.in_(["A", "B"])) == [1, 2]
+    assert ids(CardTransaction.merchant_name.is_(None)) == [3]
+
+
+def _seed_customer(session):
+    customer = CustomerCore(tax_id="1")
+    account = Account(customer=customer, account_type="checking")
+    card = Card(customer=customer, card_number="1", product_type="credit")
+    invoice = CardInvoice(
+        card=card, statement_date=date(2024, 1, 31), due_date=date(2024, 2, 10), total_amount=1, minimum_payment=1
+    )
+    session.add_all([account, invoice])
+    session.flush()
+    session.add(AccountTransaction(id=1, account=account, amount=1, posting_date=date(2024, 1, 2)))
+    session.commit()
+    customer_id = customer.id
+    session.expunge_all()
+    return customer_id
+
+
+def _deletes(statements):
+    return [statement for statement in statements if statement.startswith("DELETE")]
+
+
+def test_delete_without_loaded_collections_leaves_cascade_to_database(session, statements):
+    customer_id = _seed_customer(session)
+    statements.clear()
+    session.delete(session.get(CustomerCore, customer_id, options=default_options()))
+    session.commit()
+
+    assert len(_deletes(statements)) == 1
+    assert session.scalar(select(func.count()).select_from(AccountTransaction)) == 0
+    assert session.scalar(select(func.count()).select_from(CardInvoice)) == 0
+
+
+def test_core_delete_leaves_cascade_to_database(session, statements):
+    customer_id = _seed_customer(session)
+    statements.clear()
+    session.execute(delete(CustomerCore).where(CustomerCore.id == customer_id))
+    session.commit()
+
+    assert len(statements) == 1
+    assert session.scalar(select(func.count()).select_from(Account)) == 0
+
+
+def test_delete_with_loaded_collections_deletes_loaded_children(session, statements):
+    customer_id = _seed_customer(session)
+    statements.clear()
+    session.delete(session.get(CustomerCore, customer_id))
+    session.commit()
+
+    deletes = _deletes(statements)
+    assert len(deletes) > 1
+    # Time series collections are never loaded implicitly.
+    assert not any("account_transactions" in statement for statement in deletes)
+    assert session.scalar(select(func.count()).select_from(AccountTransaction)) == 0
+
+
+def test_currency_and_mcc_compare_on_key_columns(session):
+    register_merchant_category_codes(session, {"0742": "Veterinary", "5411": None})
+    card = Card(customer=CustomerCore(tax_id="1"), card_number="1", product_type="credit")
+    session.add_all(
+        [
+            CardTransaction(id=1, card=card, amount=1, transaction_date=date(2024, 1, 2), mcc="0742"),
+            CardTransaction(id=2, card=card, amount=1, transaction_date=date(2024, 1, 2), currency="USD"),
+        ]
+    )
+    session.commit()
+
+    def ids(criterion):
+        return session.scalars(select(CardTransaction.id).where(criterion).order_by(CardTransaction.id)).all()
+
+    assert ids(CardTransaction.currency == "USD") == [2]
+    assert ids(CardTransaction.currency != "USD") == [1]
+    assert ids(CardTransaction.currency.in_(["USD", "BRL"])) == [1, 2]
+    assert ids(CardTransaction.mcc == "0742") == [1]
+    assert ids(CardTransaction.mcc.is_(None)) == [2]
+
+    compiled = (CardTransaction.currency == "USD").compile()
+    assert str(compiled) == "card_transactions.currency_id = :currency_id_1"
+    assert compiled.params == {"currency_id_1": 840}
+
+    session.expunge_all()
+    loaded = session.scalars(select(CardTransaction).order_by(CardTransaction.id)).all()
+    assert [(t.currency, t.mcc) for t in loaded] == [("BRL", "0742"), ("USD", None)]
+
+
+def test_currency_setter_accepts_none_and_rejects_unknown_codes(session):
+    customer = CustomerCore(tax_id="1")
+    session.add(customer)
+    session.flush()
+    order = PaymentOrder(customer_id=customer.id, amount=1, scope="pix", currency=None)
+    session.add(order)
+    session.flush()
+    assert order.currency == "BRL"
+
+    with pytest.raises(ValueError, match="unknown currency code 'XAU'"):
+        PaymentOrder(currency="XAU")
+    with pytest.raises(ValueError, match="invalid merchant category code"):
+        CardTransaction(mcc="54a1")
+
+
+def test_code_comparator_rejects_unsupported_operators():
+    with pytest.raises(ValueError, match="not supported on code attributes"):
+        PaymentOrder.currency.like("US%")
+    with pytest.raises(ValueError, match="not supported on code attributes"):
+        CardTransaction.mcc > "5000"
@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+from datetime import date
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from protege_ai import (
+    Card,
+    CardTransaction,
+    CustomerCore,
+    FxOperation,
+    InvestmentMovement,
+    bulk_insert,
+    get_customer_by_tax_id,
+    get_customer_id_by_tax_id,
+    register_merchant_category_codes,
+)
+from protege_ai import repository
+
+
+@pytest.fixture(autouse=True)
+def _empty_customer_cache():
+    repository.invalidate_customer_cache()
+    yield
+    repository.invalidate_customer_cache()
+
+
+@pytest.fixture
+def customer_id(engine):
+    with Session(engine) as session:
+        customer = CustomerCore(tax_id="111")
+        session.add(customer)
+        session.commit()
+        return customer.id
+
+
+def test_customer_id_cache_hit_issues_no_query(engine, customer_id, statements):
+    with Session(engine) as session:
+        assert get_customer_id_by_tax_id(session, "111") == customer_id
+        assert len(statements) == 1
+        assert get_customer_id_by_tax_id(session, "111") == customer_id
+        assert len(statements) == 1
+
+
+def test_unknown_tax_id_is_not_cached(session):
+    assert get_customer_id_by_tax_id(session, "missing") is None
+    assert repository._cached_customer_id("missing") is None
+
+
+def test_customer_cache_expires(engine, customer_id, monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(repository.time, "monotonic", lambda: clock[0])
+    with Session(engine) as session:
+        get_customer_id_by_tax_id(session, "111")
+    assert repository._cached_customer_id("111") == customer_id
+    clock[0] += repository.CUSTOMER_CACHE_TTL + 1
+    assert repository._cached_customer_id("111") is None
+
+
+def test_customer_cache_evicts_least_recently_used(monkeypatch):
+    monkeypatch.setattr(repository, "CUSTOMER_CACHE_SIZE", 2)
+    repository._cache_customer_id("a", 1)
+    repository._cache_customer_id("b", 2)
+    repository._cached_customer_id("a")
+    repository._cache_customer_id("c", 3)
+    assert repository._cached_customer_id("a") == 1
+    assert repository._cached_customer_id("b") is None
+    assert repository._cached_customer_id("c") == 3
+
+
+def test_rename_after_commit_evicts_old_tax_id(engine, customer_id):
+    with Session(engine) as session:
+        customer = get_customer_by_tax_id(session, "111")
+        session.commit()
+        # ``customer`` is expired by the commit; the old tax id must still
+        # be known when it is renamed.
+        customer.tax_id = "222"
+        session.commit()
+    with Session(engine) as session:
+        assert get_customer_id_by_tax_id(session, "111") is None
+        assert get_customer_id_by_tax_id(session, "222") == customer_id
+
+
+def test_delete_evicts_tax_id(engine, customer_id):
+    with Session(engine) as session:
+        session.delete(get_customer_by_tax_id(session, "111"))
+        session.commit()
+    with Session(engine) as session:
+        assert get_customer_id_by_tax_id(session, "111") is None
+
+
+def test_uncommitted_customer_is_not_cached(engine):
+    with Session(engine) as session:
+        session.add(CustomerCore(tax_id="333"))
+        assert get_customer_id_by_tax_id(session, "333") is not None
+        assert repository._cached_customer_id("333") is None
+        session.rollback()
+        assert get_customer_id_by_tax_id(session, "333") is None
+
+    with Session(engine) as session:
+        session.add(CustomerCore(tax_id="333"))
+        session.commit()
+        assert get_customer_id_by_tax_id(session, "333") is not None
+        assert repository._cached_customer_id("333") is not None
+
+
+def _movement(customer_id, i, **values):
+    return dict(
+        id=i,
+        customer_id=customer_id,
+        instrument_id="BOVA11",
+        movement_type="buy",
+        quantity=1,
+        price=1,
+        amount=1,
+        transaction_date=date(2024, 1, 2),
+        external_id=f"ext-{i}",
+        **values,
+    )
+
+
+def test_bulk_insert_sends_one_statement(session, statements):
+    customer = CustomerCore(tax_id="111")
+    session.add(customer)
+    session.flush()
+    statements.clear()
+
+    bulk_insert(session, InvestmentMovement, [_movement(customer.id, i) for i in range(1, 51)])
+    assert len(statements) == 1
+    assert session.scalar(select(func.count()).select_from(InvestmentMovement)) == 50
+
+
+def test_bulk_insert_returns_ids_in_row_order(session):
+    customer = CustomerCore(tax_id="111")
+    session.add(customer)
+    session.flush()
+    rows = [
+        dict(
+            customer_id=customer.id,
+            currency_pair="USD/BRL",
+            notional=notional,
+            nature="buy",
+            settlement_date=date(2024, 1, 2),
+        )
+        for notional in (3, 1, 2)
+    ]
+    ids = [row.id for row in bulk_insert(session, FxOperation, rows, return_ids=True)]
+    notionals = dict(session.execute(select(FxOperation.id, FxOperation.notional)).all())
+    assert [notionals[i] for i in ids] == [3, 1, 2]
+
+
+def test_bulk_insert_ignore_conflicts(session):
+    customer = CustomerCore(tax_id="111")
+    session.add(customer)
+    session.flush()
+    rows = [_movement(customer.id, i) for i in range(1, 4)]
+
+    bulk_insert(session, InvestmentMovement, rows)
+    bulk_insert(session, InvestmentMovement, rows + [_movement(customer.id, 4)], ignore_conflicts=True)
+    assert session.scalar(select(func.count()).select_from(InvestmentMovement)) == 4
+
+
+def test_bulk_insert_folds_hybrid_keys(session):
+    register_merchant_category_codes(session, {"5411": None})
+    card = Card(customer=CustomerCore(tax_id="111"), card_number="1", product_type="credit")
+    session.add(card)
+    session.flush()
+    row = dict(
+        id=1,
+        card_id=card.id,
+        customer_id=card.customer_id,
+        amount=1,
+        transaction_date=date(2024, 1, 2),
+        currency="USD",
+        mcc="5411",
+        merchant_name="Acme",
+        description="groceries",
+        extra={"terminal": "T1"},
+    )
+
+    bulk_insert(session, CardTransaction, [row])
+    transaction = session.scalars(select(CardTransaction)).one()
+    assert (transaction.currency_id, transaction.mcc_id) == (840, 5411)
+    assert transaction.extra == {"terminal": "T1", "merchant_name": "Acme", "description": "groceries"}
+    assert row["extra"] == {"terminal": "T1"}